@@ -38,6 +38,7 @@ def main():
     config, replaces = staticcldf.load_config(base_path)
     config["base_path"] = base_path
     config["output_path"] = base_path / config["output_path"]
+    config["template_path"] = base_path / "template_html"
 
     # Read CLDF data
     cldf_data = staticcldf.read_cldf_data(config)
@@ -1,15 +1,19 @@
 # __init__.py
 
+# NOTE: do not JIT-compile the functions of this package (e.g. with
+# `numba.jit`): they are all string, dictionary, and file manipulation,
+# which Numba can only run in object mode, more slowly than plain CPython
+# (see numba/numba#2585 and #7535). Any future numeric code (such as
+# dataset statistics) should go in a separate module.
+
 # Import Python standard libraries
 import datetime
 import json
 import logging
 from pathlib import Path
-from string import Template
 
 # Import 3rd party libraries
 import markdown
-from tabulate import tabulate
 
 # Import from local modules
 from .input_cldf import read_cldf_data
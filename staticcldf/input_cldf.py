@@ -1,7 +1,109 @@
+# Import Python standard libraries
+import functools
+import os
+from operator import itemgetter
+
 # Import MPI-SHH libraries
+from csvw.dsv import Dialect, UnicodeReader
 from pycldf.dataset import Dataset
 
 
+@functools.lru_cache(maxsize=4)
+def _load_dataset(metadata, mtime_ns):
+    """
+    Load a CLDF dataset from its metadata, once per metadata file version.
+
+    Parameters
+    ----------
+    metadata : pathlib.Path
+        Path to the JSON metadata of the dataset.
+    mtime_ns : int
+        Modification time of the metadata file, only used as part of the
+        cache key, so that edits to the metadata are picked up.
+    """
+
+    return Dataset.from_metadata(metadata)
+
+
+def _needs_parsing(column):
+    """
+    Check whether the raw values of a column must be parsed by the schema.
+
+    Only columns with list values, non-string datatypes, or custom null and
+    default values need parsing; the values of other columns are the text
+    read from the CSV file.
+
+    Parameters
+    ----------
+    column : csvw.metadata.Column
+        The column to check.
+    """
+
+    return bool(
+        column.inherit("separator")
+        or column.datatype.base != "string"
+        or column.inherit_null() != [""]
+        or column.inherit("default")
+    )
+
+
+def _read_table_rows(table, table_path):
+    """
+    Read the rows of a CLDF table as lists of raw values.
+
+    The reader honours the CSVW dialect of the table (delimiter, encoding,
+    comments, skipped rows, trimming, etc.), and header cells are matched
+    to columns by name or title, as in `csvw`. Tables that are not plain
+    local files (such as zipped or remote ones), with virtual columns, or
+    with columns not found in the header cannot be read this way, and
+    `None` is returned for them.
+
+    Parameters
+    ----------
+    table : csvw.metadata.Table
+        The table to read.
+    table_path : pathlib.Path or str
+        Path (or URL) to the CSV file of the table.
+
+    Returns
+    -------
+    rows : list
+        A list of rows, each a list of strings.
+    indices : list
+        The index in the rows of the values of each column in the schema.
+    """
+
+    columns = table.tableSchema.columns
+    if not os.path.isfile(table_path):
+        return None
+    if any(col.virtual for col in columns):
+        return None
+
+    dialect = table.inherit("dialect") or Dialect()
+    with UnicodeReader(table_path, dialect=dialect) as reader:
+        if dialect.header:
+            header = next(reader)
+            for _ in range(dialect.headerRowCount - 1):
+                next(reader)
+        else:
+            header = [col.header for col in columns]
+
+        # Map the header cells to the columns of the schema, keeping the
+        # first cell that matches each column
+        positions = {}
+        for idx, name in enumerate(header):
+            col = table.tableSchema.get_column(name)
+            if col is not None:
+                positions.setdefault(col.header, idx)
+        indices = [positions.get(col.header) for col in columns]
+        if None in indices:
+            return None
+
+        rows = list(reader)
+
+    return rows, indices
+
+
 def read_cldf_data(config):
     """
     Read CLDF data as lists of Python dictionaries.
@@ -17,7 +119,7 @@ def read_cldf_data(config):
 
     # Read dataset from metadata
     metadata = config["base_path"] / "demo_cldf" / "cldf-metadata.json"
-    dataset = Dataset.from_metadata(metadata.as_posix())
+    dataset = _load_dataset(metadata, metadata.stat().st_mtime_ns)
 
     # Transform the dataset in a Python datastructure (`cldf_data`) suitable
     # for Jinja template manipulation. `cldf_data` is a dictionary of
@@ -45,36 +147,71 @@ def read_cldf_data(config):
         valueUrls = [col.valueUrl for col in table.tableSchema.columns]
         datatypes = [col.datatype.base for col in table.tableSchema.columns]
 
-        # Holder for the table values in the returned structure
-        table_data = []
-
-        # Iterate over all rows for the current table
-        for row in table:
-            # Holder for the row in the returned structure
-            row_data = []
-
-            # Iterate over all columns for the current row
-            for column, valueUrl in zip(column_names, valueUrls):
-                if not row[column]:
-                    value = ""
-                elif isinstance(row[column], (list, tuple)):
-                    value = " ".join([str(value) for value in row[column]])
-                else:
-                    value = str(row[column])
-
-                if valueUrl:
-                    # Ugly replacement, but works with CLDF metadata
-                    # (assuming there is a single replacement)
-                    var_name = list(valueUrl.variable_names)[0]
-                    url = valueUrl.expand(**{var_name: value})
+        # Read all rows a single time as plain lists, so that values can be
+        # pulled column by column with fixed indices, instead of having
+        # `pycldf` build a dictionary for every row; tables that cannot be
+        # read this way are read through `pycldf`, with values already
+        # parsed according to the schema
+        table_path = table.url.resolve(dataset.directory)
+        fast_read = _read_table_rows(table, table_path)
+        if fast_read:
+            rows, indices = fast_read
+            parsed = False
+        else:
+            rows = [
+                [row[col.header] for col in table.tableSchema.columns]
+                for row in table.iterdicts()
+            ]
+            indices = range(len(column_names))
+            parsed = True
+
+        # Extract values and urls as columns ("structure of arrays"), so
+        # that the kind of value is decided once per column, from the
+        # schema, and not for every cell; list-valued columns are joined
+        # with spaces
+        column_values = []
+        column_urls = []
+        for col, idx, valueUrl in zip(
+            table.tableSchema.columns, indices, valueUrls
+        ):
+            # Only columns with list values, non-string datatypes, or
+            # custom null and default values need to be parsed according
+            # to the schema; plain text columns are used as read (values are
+            # pulled with `itemgetter`, which does the indexing in C)
+            cells = map(itemgetter(idx), rows)
+            if parsed or _needs_parsing(col):
+                if not parsed:
+                    cells = map(col.read, cells)
+                if col.inherit("separator"):
+                    values = [
+                        " ".join([str(value) for value in cell])
+                        if cell
+                        else ""
+                        for cell in cells
+                    ]
                 else:
-                    url = None
-
-                # Append computed values to `row_data`
-                row_data.append({"value": value, "url": url})
-
-            # Append current row to the table
-            table_data.append(row_data)
+                    values = [str(cell) if cell else "" for cell in cells]
+            else:
+                values = list(cells)
+
+            if valueUrl:
+                # Ugly replacement, but works with CLDF metadata
+                # (assuming there is a single replacement)
+                var_name = list(valueUrl.variable_names)[0]
+                urls = [
+                    valueUrl.expand(**{var_name: value}) for value in values
+                ]
+            else:
+                urls = [None] * len(values)
+
+            column_values.append(values)
+            column_urls.append(urls)
+
+        # Transpose the columns back into the list of rows of the structure
+        table_data = [
+            [{"value": value, "url": url} for value, url in zip(values, urls)]
+            for values, urls in zip(zip(*column_values), zip(*column_urls))
+        ]
 
         #  Append contents to overall table
         column_data = [
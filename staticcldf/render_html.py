@@ -1,18 +1,73 @@
+import concurrent.futures
 import datetime
+import html
 import logging
-
-from tabulate import tabulate
+import os
+import shutil
+from collections import ChainMap
 
 from . import utils
 
 # TODO: fix navigation bar
 
 
+def iter_html_table(datatable):
+    """
+    Render a table from the CLDF data structure directly as HTML.
+
+    The HTML is generated one row at a time, so that the template can
+    stream it to the output file without holding the entire table in
+    memory; this is considerably faster than iterating over each cell in
+    the Jinja template for large tables. Values are escaped here, so the
+    fragments can be inserted verbatim into the template.
+    """
+
+    header = "".join(
+        f"<th>{html.escape(column['name'])}</th>"
+        for column in datatable["columns"]
+    )
+    yield '<table id="data_table" class="display">\n<thead>\n'
+    yield f"<tr>{header}</tr>\n</thead>\n<tbody>\n"
+
+    for row in datatable["rows"]:
+        parts = ["<tr>"]
+        for cell in row:
+            # Most values have no special characters, so the (comparatively
+            # expensive) escaping is only performed when it is needed
+            value = cell["value"]
+            if "&" in value or "<" in value or ">" in value:
+                value = html.escape(value, quote=False)
+            if cell["url"]:
+                url = html.escape(cell["url"])
+                parts.append(f'<td><a href="{url}">{value}</a></td>')
+            else:
+                parts.append(f"<td>{value}</td>")
+        parts.append("</tr>\n")
+
+        yield "".join(parts)
+
+    yield "</tbody>\n</table>"
+
+
 def build_tables(data, replaces, template_env, config):
-    for table in data:
-        table_replaces = replaces.copy()
-        table_replaces["datatable"] = data[table]
-        build_html(template_env, table_replaces, "%s.html" % table, config)
+    # All tables share the same template, which is loaded only once
+    template = template_env.get_template("datatable.html")
+
+    # Inner function for building a single table page; the table contents
+    # are passed as an extra replacement, so that `replaces` can be shared
+    # by all threads without copying or mutating it
+    def _build_table(table):
+        table_html = iter_html_table(data[table])
+        build_html(
+            template, replaces, f"{table}.html", config, table_html=table_html
+        )
+
+    # Pages are independent, so they are built concurrently, overlapping the
+    # rendering of one table with the writing of another; there is one
+    # worker per table, up to four
+    max_workers = max(1, min(len(data), 4))
+    with concurrent.futures.ThreadPoolExecutor(max_workers) as executor:
+        list(executor.map(_build_table, data))
 
 
 def build_sql_page(data, replaces, template_env, config):
@@ -23,7 +78,7 @@ def build_sql_page(data, replaces, template_env, config):
         for row in data[table_name]["rows"]:
             row_insert = ", ".join(
                 [
-                    "'%s'" % cell["value"] if cell["value"] else "NULL"
+                    f"'{cell['value']}'" if cell["value"] else "NULL"
                     for cell in row
                 ]
             )
@@ -35,47 +90,50 @@ def build_sql_page(data, replaces, template_env, config):
     for table_name in data:
         schemata[table_name] = ", ".join(
             [
-                "%s text" % col["name"].lower()
+                f"{col['name'].lower()} text"
                 for col in data[table_name]["columns"]
             ]
         )
 
     # Generate page
-    sql_replaces = replaces.copy()
-    sql_replaces["data"] = inline_data
-    sql_replaces["schemata"] = schemata
-    build_html(template_env, sql_replaces, "sql.html", config)
+    template = template_env.get_template("sql.html")
+    build_html(
+        template,
+        replaces,
+        "sql.html",
+        config,
+        data=inline_data,
+        schemata=schemata,
+    )
 
 
-# TODO: write properly etc. should load with other templates;
 # TODO: also copy images if needed
-def build_css(replaces, config):
-    # Build template_file and layout path
-    template_path = config["base_path"] / "template_html"
-    css_file = template_path / "main.css"
-
-    # Build css file
-    with open(css_file.as_posix()) as handler:
-        css_template = handler.read()
-
-    # Build Jinja Environment
-    from jinja2 import Environment, FileSystemLoader
+def build_css(template_env, replaces, config):
+    css_file = config["template_path"] / "main.css"
+    file_path = config["output_path"] / "main.css"
 
-    template = Environment(
-        loader=FileSystemLoader(template_path.as_posix())
-    ).from_string(css_template)
+    # Stylesheets without any Jinja syntax (the usual case) are copied as
+    # they are, skipping template compilation and rendering
+    css_source = css_file.read_text(encoding="utf-8")
+    if not any(tag in css_source for tag in ("{{", "{%", "{#")):
+        shutil.copyfile(css_file, file_path)
+        return
 
+    # Load the CSS template from the shared environment, so that it is
+    # compiled only once like the HTML templates
+    template = template_env.get_template("main.css")
     source = template.render(**replaces)
 
-    # build and writeWrite
-    file_path = config["output_path"] / "main.css"
-    with open(file_path.as_posix(), "w") as handler:
-        handler.write(source)
+    # Write
+    file_path.write_text(source, encoding="utf-8")
 
 
-def build_html(template_env, replaces, output_file, config):
+def build_html(template, replaces, output_file, config, **extra):
     """
-    Build and write an HTML file from template and replacements.
+    Build and write an HTML file from a loaded template and replacements.
+
+    Any `extra` keyword argument is passed to the template as an additional
+    replacement for the current page only.
     """
 
     tables = [
@@ -86,38 +144,46 @@ def build_html(template_env, replaces, output_file, config):
         {"name": "SQL", "url": "sql.html"},
     ]
 
-    # Load proper template and apply replacements, also setting current date
+    # Apply replacements; the output is streamed to the file in binary mode,
+    # instead of first rendering the entire page in memory
     logging.info("Applying replacements to generate `%s`...", output_file)
-    if output_file == "index.html":
-        template = template_env.get_template("index.html")
-    elif output_file == "sql.html":
-        template = template_env.get_template("sql.html")
-    else:
-        template = template_env.get_template("datatable.html")
-    source = template.render(
+    stream = template.stream(
         tables=tables,
         file=output_file,
-        current_time=datetime.datetime.now().ctime(),
-        **replaces
+        **replaces,
+        **extra
     )
 
-    # Write
     file_path = config["output_path"] / output_file
-    with open(file_path.as_posix(), "w") as handler:
-        handler.write(source)
+    with open(file_path, "wb", buffering=1 << 20) as handler:
+        stream.dump(handler, encoding="utf-8")
+        size = handler.tell()
 
-    logging.info("`%s` wrote with %i bytes.", output_file, len(source))
+    logging.info("`%s` wrote with %i bytes.", output_file, size)
 
 
 def render_html(cldf_data, replaces, config):
+    # Compute the build time a single time for all pages, so that they
+    # all report the same one; `SOURCE_DATE_EPOCH` is honored, if set, for
+    # reproducible builds; it is layered over the given `replaces` with a
+    # `ChainMap`, instead of copying them
+    if "SOURCE_DATE_EPOCH" in os.environ:
+        build_time = datetime.datetime.fromtimestamp(
+            int(os.environ["SOURCE_DATE_EPOCH"]), datetime.timezone.utc
+        )
+    else:
+        build_time = datetime.datetime.now()
+    replaces = ChainMap({"current_time": build_time.ctime()}, replaces)
+
     # Load Jinja HTML template environment
     template_env = utils.load_template_env(config)
 
     # Build and write index.html
-    build_html(template_env, replaces, "index.html", config)
+    template = template_env.get_template("index.html")
+    build_html(template, replaces, "index.html", config)
 
     # Build CSS files from template
-    build_css(replaces, config)
+    build_css(template_env, replaces, config)
 
     # Build tables from CLDF data
     build_tables(cldf_data, replaces, template_env, config)
@@ -3,13 +3,50 @@ Utility functions.
 """
 
 # Import Python standard libraries
+import functools
+import hashlib
 import json
 import logging
+import os
 
 # Import 3rd party libraries
-from jinja2 import Environment, FileSystemLoader
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
 import markdown
 
+# Import optional 3rd party libraries; the faster `orjson` is used for
+# parsing JSON when available, falling back to the standard `json`
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Configuration keys moved to the dictionary of replacements
+# TODO: "mainlink" should be derived from URL?
+_REPLACE_KEYS = (
+    "title",
+    "description",
+    "author",
+    "favicon",
+    "mainlink",
+    "citation",
+)
+
+# Options of the Jinja template environment; as they change the code
+# compiled from the templates, a fingerprint of them is part of the name of
+# the files in the bytecode cache, so that changing them never serves stale
+# bytecode
+_ENV_OPTIONS = {
+    "auto_reload": False,
+    "cache_size": -1,
+    "autoescape": False,
+    "trim_blocks": True,
+    "lstrip_blocks": True,
+    "keep_trailing_newline": False,
+}
+_ENV_FINGERPRINT = hashlib.sha1(
+    repr(sorted(_ENV_OPTIONS.items())).encode("utf-8")
+).hexdigest()[:12]
+
 
 def load_config(base_path):
     """
@@ -34,16 +71,30 @@ def load_config(base_path):
 
     # Load JSON data
     logging.info("Loading JSON configuration...")
-    with open("config.json") as config_file:
-        config = json.load(config_file)
-
-    # Inner function for loading markdown files and converting them to HTML
-    # TODO: only convert if .md
-    def _md2html(filename, base_path):
-        logging.info("Reading contents from `%s`..." % filename)
-        content_path = base_path / "contents" / filename
-        with open(content_path.as_posix()) as handler:
-            source = markdown.markdown(handler.read())
+    with open("config.json", "rb") as config_file:
+        source = config_file.read()
+    if orjson:
+        config = orjson.loads(source)
+    else:
+        config = json.loads(source)
+
+    # Directory of content files, resolved a single time for all of them
+    contents_dir = base_path / "contents"
+
+    # Inner function for loading markdown files and converting them to HTML;
+    # a single `Markdown` instance is shared by all calls, so that its
+    # processors are not rebuilt for every file, and files with other
+    # extensions are returned as-is
+    md = markdown.Markdown()
+
+    def _md2html(filename):
+        logging.info("Reading contents from `%s`...", filename)
+        content_path = contents_dir / filename
+        source = content_path.read_text(encoding="utf-8")
+
+        if filename.lower().endswith(".md"):
+            md.reset()
+            source = md.convert(source)
 
         return source
 
@@ -53,14 +104,7 @@ def load_config(base_path):
     # structure to learn. Remember that, in order to make
     # deployment easy, we are being quite strict here in terms of
     # templates, etc.
-    replaces = {
-        "title": config.pop("title"),
-        "description": config.pop("description"),
-        "author": config.pop("author"),
-        "favicon": config.pop("favicon"),
-        "mainlink": config.pop("mainlink"),  # TODO: should be derived from URL?
-        "citation": config.pop("citation"),
-    }
+    replaces = {key: config.pop(key) for key in _REPLACE_KEYS}
 
     return config, replaces
 
@@ -68,12 +112,38 @@ def load_config(base_path):
 def load_template_env(config):
     logging.info("Loading templates...")
 
-    # Build template_file and layout path
-    template_path = config["base_path"] / "template_html"
+    # Compiled templates are also cached on disk, next to the sources
+    cache_path = config["base_path"] / ".jinja_cache"
+
+    return _get_template_env(config["template_path"], cache_path)
+
+
+@functools.lru_cache(maxsize=8)
+def _get_template_env(template_path, cache_path):
+    """
+    Build a Jinja template environment, once per template path.
+
+    As the environment is kept across calls, templates are compiled a
+    single time per process; the compiled bytecode is also stored in
+    `cache_path`, under a fingerprint of the environment options, so that
+    later builds skip the parsing and compilation of unchanged templates.
+    Templates are not checked for changes on disk (`auto_reload`), as they
+    are not expected to change during a build, and are never evicted from
+    the in-memory cache (`cache_size`). Autoescaping is explicitly
+    disabled: the HTML tables are escaped when generated, and scanning them
+    again in the templates would be both redundant and expensive.
+    Whitespace around block tags is trimmed, so that the templates produce
+    less output.
+    """
 
     # Build Jija template environment
+    os.makedirs(cache_path, exist_ok=True)
     template_env = Environment(
-        loader=FileSystemLoader(template_path.as_posix())
+        loader=FileSystemLoader(template_path),
+        bytecode_cache=FileSystemBytecodeCache(
+            cache_path, f"{_ENV_FINGERPRINT}-%s.cache"
+        ),
+        **_ENV_OPTIONS,
     )
 
     return template_env